@@ -536,7 +536,7 @@ SCREENSHOT_SELENIUM_ANIMATION_WAIT = 5
 # ---------------------------------------------------
 # The file upload folder, when using models with files
 UPLOAD_FOLDER = BASE_DIR + "/app/static/uploads/"
-UPLOAD_CHUNK_SIZE = 4096
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
 # The image upload folder, when using models with images
 IMG_UPLOAD_FOLDER = BASE_DIR + "/app/static/uploads/"
@@ -20,10 +20,12 @@ import logging
 import re
 from contextlib import closing
 from datetime import datetime
+from itertools import chain
 from typing import (
     Any,
     Callable,
     Dict,
+    Iterable,
     List,
     Match,
     NamedTuple,
@@ -45,7 +47,7 @@ from flask_babel import gettext as __, lazy_gettext as _
 from marshmallow import fields, Schema
 from marshmallow.validate import Range
 from sqlalchemy import column, select, types
-from sqlalchemy.engine.base import Engine
+from sqlalchemy.engine.base import Connection, Engine
 from sqlalchemy.engine.interfaces import Compiled, Dialect
 from sqlalchemy.engine.reflection import Inspector
 from sqlalchemy.engine.url import make_url, URL
@@ -58,6 +60,7 @@ from typing_extensions import TypedDict
 
 from superset import security_manager, sql_parse
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
+from superset.exceptions import NoDataException
 from superset.models.sql_lab import Query
 from superset.models.sql_types.base import literal_dttm_type_factory
 from superset.sql_parse import ParsedQuery, Table
@@ -294,6 +297,11 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
     max_column_name_length = 0
     try_remove_schema_from_table_name = True  # pylint: disable=invalid-name
     run_multiple_statements_as_one = False
+
+    # Whether uploads can be written one chunk at a time, i.e. the first chunk
+    # honoring ``if_exists`` and the remaining chunks being appended to the table
+    supports_chunked_upload = True
+
     custom_errors: Dict[
         Pattern[str], Tuple[str, SupersetErrorType, Dict[str, Any]]
     ] = {}
@@ -672,6 +680,65 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
         """
 
         engine = cls.get_engine(database)
+        cls._df_to_sql(engine, table, df, to_sql_kwargs)
+
+    @classmethod
+    def df_chunks_to_sql(
+        cls,
+        database: "Database",
+        table: Table,
+        chunks: Iterable[pd.DataFrame],
+        to_sql_kwargs: Dict[str, Any],
+    ) -> None:
+        """
+        Upload data from an iterable of Pandas DataFrames to a database.
+
+        The chunks are written within a single transaction as they are consumed, so
+        only one chunk needs to be held in memory at a time and a failed upload rolls
+        back the rows written so far. The first chunk honors the
+        `if_exists` argument whereas the remaining chunks are appended to the table.
+        For engines that don't support chunked uploads the chunks are concatenated and
+        uploaded via `df_to_sql`.
+
+        Note this method does not create metadata for the table.
+
+        :param database: The database to upload the data to
+        :param table: The table to upload the data to
+        :param chunks: The dataframes with data to be uploaded
+        :param to_sql_kwargs: The kwargs to be passed to pandas.DataFrame.to_sql` method
+        :raises NoDataException: If there are no chunks to upload
+        """
+
+        # Without any chunk the table couldn't be created, nor replaced
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+
+        if first_chunk is None:
+            raise NoDataException("There is no data to upload")
+
+        chunks = chain([first_chunk], chunks)
+
+        if not cls.supports_chunked_upload:
+            dfs = list(chunks)
+            df = dfs[0] if len(dfs) == 1 else pd.concat(dfs, copy=False)
+            cls.df_to_sql(database, table, df, to_sql_kwargs)
+            return
+
+        engine = cls.get_engine(database)
+
+        with engine.begin() as connection:
+            for chunk in chunks:
+                cls._df_to_sql(connection, table, chunk, to_sql_kwargs)
+                to_sql_kwargs["if_exists"] = "append"
+
+    @classmethod
+    def _df_to_sql(
+        cls,
+        con: Union[Connection, Engine],
+        table: Table,
+        df: pd.DataFrame,
+        to_sql_kwargs: Dict[str, Any],
+    ) -> None:
         to_sql_kwargs["name"] = table.table
 
         if table.schema:
@@ -679,10 +746,28 @@ class BaseEngineSpec:  # pylint: disable=too-many-public-methods
             # Only add schema when it is preset and non empty.
             to_sql_kwargs["schema"] = table.schema
 
-        if engine.dialect.supports_multivalues_insert:
-            to_sql_kwargs["method"] = "multi"
+        method = cls.get_df_to_sql_method(con.dialect)
+
+        if method:
+            to_sql_kwargs["method"] = method
+
+        df.to_sql(con=con, **to_sql_kwargs)
+
+    @classmethod
+    def get_df_to_sql_method(
+        cls, dialect: Dialect
+    ) -> Optional[Union[str, Callable[..., None]]]:
+        """
+        Return the insertion method passed to `pandas.DataFrame.to_sql`, i.e. either
+        `None`, `multi` or a callable with signature `(table, conn, keys, data_iter)`.
 
-        df.to_sql(con=engine, **to_sql_kwargs)
+        :param dialect: The dialect of the database the data is uploaded to
+        :return: The pandas insertion method
+        """
+        if dialect.supports_multivalues_insert:
+            return "multi"
+
+        return None
 
     @classmethod
     def convert_dttm(  # pylint: disable=unused-argument
@@ -92,6 +92,10 @@ class HiveEngineSpec(PrestoEngineSpec):
     allows_alias_to_source_column = True
     allows_hidden_ordeby_agg = False
 
+    # Uploads are written as a single Parquet file backing an external table,
+    # which cannot be appended to
+    supports_chunked_upload = False
+
     # When running `SHOW FUNCTIONS`, what is the name of the column with the
     # function names?
     _show_functions_column = "tab_name"
@@ -14,18 +14,39 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
-import io
 import os
+import shutil
 import tempfile
 import zipfile
-from typing import TYPE_CHECKING
-
+from contextlib import ExitStack
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    IO,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from flask import flash, g, redirect
 from flask_appbuilder import expose, SimpleFormView
 from flask_appbuilder.models.sqla.interface import SQLAInterface
 from flask_appbuilder.security.decorators import has_access
 from flask_babel import lazy_gettext as _
+from pandas.api.types import infer_dtype, is_dtype_equal, is_object_dtype
+from pandas.core.dtypes.cast import find_common_type
+from sqlalchemy.types import Text, TypeEngine
 from werkzeug.wrappers import Response
 from wtforms.fields import StringField
 from wtforms.validators import ValidationError
@@ -73,11 +94,309 @@ def certificate_form_validator(_: _, field: StringField) -> None:
 def upload_stream_write(form_file_field: "FileStorage", path: str) -> None:
     chunk_size = app.config["UPLOAD_CHUNK_SIZE"]
     with open(path, "bw") as file_description:
-        while True:
-            chunk = form_file_field.stream.read(chunk_size)
-            if not chunk:
-                break
-            file_description.write(chunk)
+        shutil.copyfileobj(form_file_field.stream, file_description, chunk_size)
+
+
+def get_common_extension(filenames: Iterable[str]) -> Optional[str]:
+    """
+    Return the (lowercase) extension shared by all the files, stopping at the first
+    file with a different extension.
+
+    :param filenames: The names of the files
+    :return: The common extension, or None if the extensions differ
+    """
+    extensions = (filename.rsplit(".", 1)[-1].lower() for filename in filenames)
+    extension = next(extensions, "")
+
+    if any(other != extension for other in extensions):
+        return None
+
+    return extension
+
+
+# The types of a dataframe are keyed by whether they belong to the index, and by name
+ColumnKey = Tuple[bool, Hashable]
+
+
+class ColumnType(NamedTuple):
+    dtype: Any
+    # The type inferred from the values, from which pandas picks the SQL type of object
+    # columns, or None if all the values are null
+    kind: Optional[str]
+
+
+def infer_kind(values: Union[pd.Series, pd.Index]) -> Optional[str]:
+    if not values.notna().any():
+        return None
+
+    kind = infer_dtype(values, skipna=True)
+    # Both are mapped to the same SQL type
+    return "datetime" if kind == "datetime64" else kind
+
+
+def get_column_types(df: pd.DataFrame) -> Dict[ColumnKey, ColumnType]:
+    """
+    Return the types of the columns and of the index of a dataframe. The levels of a
+    MultiIndex are left out.
+
+    :param df: The dataframe
+    :return: The types of the columns and of the index
+    """
+    values: Dict[ColumnKey, Union[pd.Series, pd.Index]] = {
+        (False, column): series for column, series in df.items()
+    }
+
+    if not isinstance(df.index, pd.MultiIndex):
+        values[(True, df.index.name)] = df.index
+
+    return {
+        key: ColumnType(value.dtype, infer_kind(value)) for key, value in values.items()
+    }
+
+
+def get_common_types(
+    frame_types: Iterable[Dict[ColumnKey, ColumnType]]
+) -> Tuple[Dict[ColumnKey, Any], Dict[Hashable, TypeEngine]]:
+    """
+    Combine the types of the chunks of an upload into the types they would have once
+    concatenated.
+
+    Chunks are uploaded one at a time, hence the table is created from the first chunk
+    and its types must hold the values of all the chunks. Besides the dtypes to cast the
+    chunks to, the SQL types of the object columns whose values differ in kind are
+    returned, as pandas infers them from the values of the first chunk only.
+
+    :param frame_types: The types of each chunk, see `get_column_types`
+    :return: The common dtypes, and the SQL types to be passed to `to_sql`
+    """
+    dtypes: Dict[ColumnKey, Set[Any]] = {}
+    kinds: Dict[ColumnKey, Set[str]] = {}
+
+    for i, types in enumerate(frame_types):
+        # Columns missing from a chunk are filled with NaN
+        for key in dtypes.keys() - types.keys():
+            dtypes[key].add(np.dtype(float))
+
+        for key, (dtype, kind) in types.items():
+            dtypes.setdefault(key, {np.dtype(float)} if i else set()).add(dtype)
+            kinds.setdefault(key, set())
+
+            if kind:
+                kinds[key].add(kind)
+
+    common_dtypes = {
+        key: find_common_type(list(types)) for key, types in dtypes.items()
+    }
+    sql_dtypes = {
+        name: Text()
+        for (is_index, name), dtype in common_dtypes.items()
+        if is_object_dtype(dtype) and len(kinds[(is_index, name)]) > 1
+    }
+
+    return common_dtypes, sql_dtypes
+
+
+def cast_to_dtypes(
+    chunks: Iterable[pd.DataFrame], dtypes: Dict[ColumnKey, Any]
+) -> Iterator[pd.DataFrame]:
+    """
+    Cast the chunks of an upload to the given types, leaving the chunks that already
+    have them untouched.
+
+    :param chunks: The chunks to cast
+    :param dtypes: The types of the columns and of the index, see `get_common_types`
+    :return: The cast chunks
+    """
+    columns = [name for is_index, name in dtypes if not is_index]
+    index_dtype = next((dtypes[key] for key in dtypes if key[0]), None)
+
+    for chunk in chunks:
+        if list(chunk.columns) != columns:
+            chunk = chunk.reindex(columns=columns, copy=False)
+
+        changed = {
+            name: dtypes[(False, name)]
+            for name, dtype in chunk.dtypes.items()
+            if not is_dtype_equal(dtype, dtypes[(False, name)])
+        }
+
+        cast_index = index_dtype is not None and not is_dtype_equal(
+            chunk.index.dtype, index_dtype
+        )
+
+        if changed or cast_index:
+            chunk = chunk.copy(deep=False)
+
+        # Columns are replaced one at a time, as astype() would rebuild the whole
+        # dataframe and consolidate its blocks
+        for name, dtype in changed.items():
+            chunk[name] = chunk[name].astype(dtype)
+
+        if cast_index:
+            chunk.index = chunk.index.astype(index_dtype)
+
+        yield chunk
+
+
+def get_parquet_column_types(
+    parquet_file: pq.ParquetFile, columns: Optional[List[str]]
+) -> Dict[ColumnKey, ColumnType]:
+    """
+    Return the types of the columns and of the index of the dataframes read from a
+    Parquet file, see `read_parquet_files`. The types are derived from the schema and
+    the null counts of the footer rather than from the data, the kind of a column being
+    its Arrow type.
+
+    :param parquet_file: The Parquet file
+    :param columns: The columns to read, or None to read all of them
+    :return: The types of the columns and of the index
+    """
+    schema = parquet_file.schema_arrow
+    df = schema.empty_table().to_pandas()
+    metadata = parquet_file.metadata
+    nullable = set()
+
+    # Columns lacking a null count may hold nulls as well
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        if not row_group.num_rows:
+            continue
+
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            statistics = column.statistics
+            if (
+                statistics is None
+                or not statistics.has_null_count
+                or statistics.null_count
+            ):
+                nullable.add(column.path_in_schema)
+
+    fields: Dict[ColumnKey, Any] = {
+        (False, column): column for column in (columns or df.columns)
+    }
+    index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+
+    if len(index_columns) == 1:
+        fields[(True, df.index.name)] = index_columns[0]
+
+    types = {}
+
+    for (is_index, name), field in fields.items():
+        dtype = df.index.dtype if is_index else df[name].dtype
+
+        # A RangeIndex is only described by the pandas metadata
+        if not isinstance(field, str):
+            types[(is_index, name)] = ColumnType(dtype, str(dtype))
+            continue
+
+        arrow_type = schema.field(field).type
+
+        if isinstance(dtype, pd.CategoricalDtype):
+            # The categories differ from one record batch to another
+            dtype = np.dtype(object)
+        elif field in nullable and isinstance(dtype, np.dtype) and dtype.kind in "iub":
+            # pyarrow converts integers with nulls to floats, booleans to objects
+            dtype = np.dtype(object) if dtype.kind == "b" else np.dtype(float)
+
+        kind = None if pa.types.is_null(arrow_type) else str(arrow_type)
+        types[(is_index, name)] = ColumnType(dtype, kind)
+
+    return types
+
+
+def read_parquet_files(
+    parquet_files: Iterable[pq.ParquetFile], columns: Optional[List[str]]
+) -> Iterator[pd.DataFrame]:
+    """
+    Read the record batches of Parquet files as dataframes.
+
+    :param parquet_files: The Parquet files
+    :param columns: The columns to read, or None to read all of them
+    :return: The dataframes
+    """
+    for parquet_file in parquet_files:
+        batches = parquet_file.iter_batches(columns=columns, use_pandas_metadata=True)
+        empty = True
+
+        for batch in batches:
+            empty = False
+            yield batch.to_pandas(split_blocks=True)
+
+        # A file without rows has no batches, yet its columns still define the table
+        if empty:
+            yield parquet_file.read(
+                columns=columns, use_pandas_metadata=True
+            ).to_pandas()
+
+
+def open_zip_member(zipfile_ob: zipfile.ZipFile, info: zipfile.ZipInfo) -> IO[bytes]:
+    """
+    Open a member of a zip archive for random access. Seeking backwards within a
+    compressed member restarts its decompression, hence such members are decompressed
+    once into a temporary file, whereas stored members are read from the archive.
+
+    :param zipfile_ob: The zip archive
+    :param info: The member of the archive
+    :return: The seekable file of the member
+    """
+    member = zipfile_ob.open(info)
+
+    if info.compress_type == zipfile.ZIP_STORED:
+        return member
+
+    file = tempfile.TemporaryFile()  # pylint: disable=consider-using-with
+    with member:
+        shutil.copyfileobj(member, file, app.config["UPLOAD_CHUNK_SIZE"])
+    file.seek(0)
+    return file
+
+
+def create_or_refresh_sqla_table(database: models.Database, table: Table) -> SqlaTable:
+    """
+    Create the dataset for an uploaded table, or refresh its metadata if it already
+    exists. The dataset is not committed, so the caller can persist all changes in a
+    single commit.
+
+    :param database: The database the table was uploaded to
+    :param table: The uploaded table
+    :return: The dataset of the uploaded table
+    """
+    # Connect table to the database that should be used for exploration.
+    # E.g. if hive was used to upload a file, presto will be a better option
+    # to explore the table.
+    explore_database = database
+    explore_database_id = database.explore_database_id
+    if explore_database_id:
+        explore_database = (
+            db.session.query(models.Database)
+            .filter_by(id=explore_database_id)
+            .one_or_none()
+            or database
+        )
+
+    sqla_table = (
+        db.session.query(SqlaTable)
+        .filter_by(
+            table_name=table.table,
+            schema=table.schema,
+            database_id=explore_database.id,
+        )
+        .one_or_none()
+    )
+
+    if sqla_table:
+        sqla_table.fetch_metadata(commit=False)
+    if not sqla_table:
+        sqla_table = SqlaTable(table_name=table.table)
+        sqla_table.database = explore_database
+        sqla_table.database_id = database.id
+        sqla_table.user_id = g.user.get_id()
+        sqla_table.schema = table.schema
+        sqla_table.fetch_metadata(commit=False)
+        db.session.add(sqla_table)
+
+    return sqla_table
 
 
 class DatabaseView(
@@ -152,80 +471,47 @@ class CsvToDatabaseView(SimpleFormView):
             flash(message, "danger")
             return redirect("/csvtodatabaseview/form")
 
-        try:
-            df = pd.concat(
-                pd.read_csv(
-                    chunksize=1000,
-                    encoding="utf-8",
-                    filepath_or_buffer=form.csv_file.data,
-                    header=form.header.data if form.header.data else 0,
-                    index_col=form.index_col.data,
-                    infer_datetime_format=form.infer_datetime_format.data,
-                    iterator=True,
-                    keep_default_na=not form.null_values.data,
-                    mangle_dupe_cols=form.mangle_dupe_cols.data,
-                    usecols=form.usecols.data if form.usecols.data else None,
-                    na_values=form.null_values.data if form.null_values.data else None,
-                    nrows=form.nrows.data,
-                    parse_dates=form.parse_dates.data,
-                    sep=form.sep.data,
-                    skip_blank_lines=form.skip_blank_lines.data,
-                    skipinitialspace=form.skipinitialspace.data,
-                    skiprows=form.skiprows.data,
-                )
+        def read_csv() -> Iterable[pd.DataFrame]:
+            form.csv_file.data.seek(0)
+            return pd.read_csv(
+                chunksize=1000,
+                encoding="utf-8",
+                filepath_or_buffer=form.csv_file.data,
+                header=form.header.data if form.header.data else 0,
+                index_col=form.index_col.data,
+                infer_datetime_format=form.infer_datetime_format.data,
+                iterator=True,
+                keep_default_na=not form.null_values.data,
+                mangle_dupe_cols=form.mangle_dupe_cols.data,
+                usecols=form.usecols.data if form.usecols.data else None,
+                na_values=form.null_values.data if form.null_values.data else None,
+                nrows=form.nrows.data,
+                parse_dates=form.parse_dates.data,
+                sep=form.sep.data,
+                skip_blank_lines=form.skip_blank_lines.data,
+                skipinitialspace=form.skipinitialspace.data,
+                skiprows=form.skiprows.data,
             )
 
-            database = (
-                db.session.query(models.Database)
-                .filter_by(id=form.data.get("con").data.get("id"))
-                .one()
+        try:
+            dtypes, sql_dtypes = get_common_types(
+                get_column_types(chunk) for chunk in read_csv()
             )
 
-            database.db_engine_spec.df_to_sql(
+            database.db_engine_spec.df_chunks_to_sql(
                 database,
                 csv_table,
-                df,
+                cast_to_dtypes(read_csv(), dtypes),
                 to_sql_kwargs={
                     "chunksize": 1000,
+                    "dtype": sql_dtypes,
                     "if_exists": form.if_exists.data,
                     "index": form.index.data,
                     "index_label": form.index_label.data,
                 },
             )
 
-            # Connect table to the database that should be used for exploration.
-            # E.g. if hive was used to upload a csv, presto will be a better option
-            # to explore the table.
-            expore_database = database
-            explore_database_id = database.explore_database_id
-            if explore_database_id:
-                expore_database = (
-                    db.session.query(models.Database)
-                    .filter_by(id=explore_database_id)
-                    .one_or_none()
-                    or database
-                )
-
-            sqla_table = (
-                db.session.query(SqlaTable)
-                .filter_by(
-                    table_name=csv_table.table,
-                    schema=csv_table.schema,
-                    database_id=expore_database.id,
-                )
-                .one_or_none()
-            )
-
-            if sqla_table:
-                sqla_table.fetch_metadata()
-            if not sqla_table:
-                sqla_table = SqlaTable(table_name=csv_table.table)
-                sqla_table.database = expore_database
-                sqla_table.database_id = database.id
-                sqla_table.user_id = g.user.get_id()
-                sqla_table.schema = csv_table.schema
-                sqla_table.fetch_metadata()
-                db.session.add(sqla_table)
+            sqla_table = create_or_refresh_sqla_table(database, csv_table)
             db.session.commit()
         except Exception as ex:  # pylint: disable=broad-except
             db.session.rollback()
@@ -248,7 +534,7 @@ class CsvToDatabaseView(SimpleFormView):
             'CSV file "%(csv_filename)s" uploaded to table "%(table_name)s" in '
             'database "%(db_name)s"',
             csv_filename=form.csv_file.data.filename,
-            table_name=str(csv_table),
+            table_name=csv_table,
             db_name=sqla_table.database.database_name,
         )
         flash(message, "info")
@@ -303,11 +589,13 @@ class ExcelToDatabaseView(SimpleFormView):
         try:
             utils.ensure_path_exists(config["UPLOAD_FOLDER"])
             upload_stream_write(form.excel_file.data, uploaded_tmp_file_path)
+            # The upload is read from the temporary file, release its buffer.
+            form.excel_file.data.close()
 
             df = pd.read_excel(
                 header=form.header.data if form.header.data else 0,
                 index_col=form.index_col.data,
-                io=form.excel_file.data,
+                io=uploaded_tmp_file_path,
                 keep_default_na=not form.null_values.data,
                 mangle_dupe_cols=form.mangle_dupe_cols.data,
                 na_values=form.null_values.data if form.null_values.data else None,
@@ -316,12 +604,6 @@ class ExcelToDatabaseView(SimpleFormView):
                 sheet_name=form.sheet_name.data if form.sheet_name.data else 0,
             )
 
-            database = (
-                db.session.query(models.Database)
-                .filter_by(id=form.data.get("con").data.get("id"))
-                .one()
-            )
-
             database.db_engine_spec.df_to_sql(
                 database,
                 excel_table,
@@ -334,39 +616,7 @@ class ExcelToDatabaseView(SimpleFormView):
                 },
             )
 
-            # Connect table to the database that should be used for exploration.
-            # E.g. if hive was used to upload a excel, presto will be a better option
-            # to explore the table.
-            expore_database = database
-            explore_database_id = database.explore_database_id
-            if explore_database_id:
-                expore_database = (
-                    db.session.query(models.Database)
-                    .filter_by(id=explore_database_id)
-                    .one_or_none()
-                    or database
-                )
-
-            sqla_table = (
-                db.session.query(SqlaTable)
-                .filter_by(
-                    table_name=excel_table.table,
-                    schema=excel_table.schema,
-                    database_id=expore_database.id,
-                )
-                .one_or_none()
-            )
-
-            if sqla_table:
-                sqla_table.fetch_metadata()
-            if not sqla_table:
-                sqla_table = SqlaTable(table_name=excel_table.table)
-                sqla_table.database = expore_database
-                sqla_table.database_id = database.id
-                sqla_table.user_id = g.user.get_id()
-                sqla_table.schema = excel_table.schema
-                sqla_table.fetch_metadata()
-                db.session.add(sqla_table)
+            sqla_table = create_or_refresh_sqla_table(database, excel_table)
             db.session.commit()
         except Exception as ex:  # pylint: disable=broad-except
             db.session.rollback()
@@ -389,7 +639,7 @@ class ExcelToDatabaseView(SimpleFormView):
             'Excel file "%(excel_filename)s" uploaded to table "%(table_name)s" in '
             'database "%(db_name)s"',
             excel_filename=form.excel_file.data.filename,
-            table_name=str(excel_table),
+            table_name=excel_table,
             db_name=sqla_table.database.database_name,
         )
         flash(message, "info")
@@ -411,32 +661,6 @@ class ColumnarToDatabaseView(SimpleFormView):
     ) -> Response:
         database = form.con.data
         columnar_table = Table(table=form.name.data, schema=form.schema.data)
-        files = form.columnar_file.data
-        file_type = {file.filename.split(".")[-1] for file in files}
-
-        if file_type == {"zip"}:
-            zipfile_ob = zipfile.ZipFile(  # pylint: disable=consider-using-with
-                form.columnar_file.data[0]
-            )  # pylint: disable=consider-using-with
-            file_type = {filename.split(".")[-1] for filename in zipfile_ob.namelist()}
-            files = [
-                io.BytesIO((zipfile_ob.open(filename).read(), filename)[0])
-                for filename in zipfile_ob.namelist()
-            ]
-
-        if len(file_type) > 1:
-            message = _(
-                "Multiple file extensions are not allowed for columnar uploads."
-                " Please make sure all files are of the same extension.",
-            )
-            flash(message, "danger")
-            return redirect("/columnartodatabaseview/form")
-
-        read = pd.read_parquet
-        kwargs = {
-            "columns": form.usecols.data if form.usecols.data else None,
-        }
-
         if not schema_allows_csv_upload(database, columnar_table.schema):
             message = _(
                 'Database "%(database_name)s" schema "%(schema_name)s" '
@@ -459,61 +683,58 @@ class ColumnarToDatabaseView(SimpleFormView):
             flash(message, "danger")
             return redirect("/columnartodatabaseview/form")
 
-        try:
-            chunks = [read(file, **kwargs) for file in files]
-            df = pd.concat(chunks)
+        files = form.columnar_file.data
+        file_type = get_common_extension(file.filename for file in files)
+        zipfile_ob = None
 
-            database = (
-                db.session.query(models.Database)
-                .filter_by(id=form.data.get("con").data.get("id"))
-                .one()
-            )
+        if file_type == "zip":
+            zipfile_ob = zipfile.ZipFile(  # pylint: disable=consider-using-with
+                form.columnar_file.data[0]
+            )  # pylint: disable=consider-using-with
+            members = [info for info in zipfile_ob.infolist() if not info.is_dir()]
+            file_type = get_common_extension(info.filename for info in members)
 
-            database.db_engine_spec.df_to_sql(
-                database,
-                columnar_table,
-                df,
-                to_sql_kwargs={
-                    "chunksize": 1000,
-                    "if_exists": form.if_exists.data,
-                    "index": form.index.data,
-                    "index_label": form.index_label.data,
-                },
+        if file_type is None:
+            message = _(
+                "Multiple file extensions are not allowed for columnar uploads."
+                " Please make sure all files are of the same extension.",
             )
+            flash(message, "danger")
+            return redirect("/columnartodatabaseview/form")
+
+        columns = form.usecols.data if form.usecols.data else None
 
-            # Connect table to the database that should be used for exploration.
-            # E.g. if hive was used to upload a csv, presto will be a better option
-            # to explore the table.
-            expore_database = database
-            explore_database_id = database.explore_database_id
-            if explore_database_id:
-                expore_database = (
-                    db.session.query(models.Database)
-                    .filter_by(id=explore_database_id)
-                    .one_or_none()
-                    or database
+        try:
+            # The archive members, and their temporary files, are closed once the
+            # upload succeeded or failed
+            with ExitStack() as stack:
+                if zipfile_ob:
+                    stack.enter_context(zipfile_ob)
+                    files = [
+                        stack.enter_context(open_zip_member(zipfile_ob, info))
+                        for info in members
+                    ]
+
+                parquet_files = [pq.ParquetFile(file) for file in files]
+                dtypes, sql_dtypes = get_common_types(
+                    get_parquet_column_types(parquet_file, columns)
+                    for parquet_file in parquet_files
                 )
 
-            sqla_table = (
-                db.session.query(SqlaTable)
-                .filter_by(
-                    table_name=columnar_table.table,
-                    schema=columnar_table.schema,
-                    database_id=expore_database.id,
+                database.db_engine_spec.df_chunks_to_sql(
+                    database,
+                    columnar_table,
+                    cast_to_dtypes(read_parquet_files(parquet_files, columns), dtypes),
+                    to_sql_kwargs={
+                        "chunksize": 1000,
+                        "dtype": sql_dtypes,
+                        "if_exists": form.if_exists.data,
+                        "index": form.index.data,
+                        "index_label": form.index_label.data,
+                    },
                 )
-                .one_or_none()
-            )
 
-            if sqla_table:
-                sqla_table.fetch_metadata()
-            if not sqla_table:
-                sqla_table = SqlaTable(table_name=columnar_table.table)
-                sqla_table.database = expore_database
-                sqla_table.database_id = database.id
-                sqla_table.user_id = g.user.get_id()
-                sqla_table.schema = columnar_table.schema
-                sqla_table.fetch_metadata()
-                db.session.add(sqla_table)
+            sqla_table = create_or_refresh_sqla_table(database, columnar_table)
             db.session.commit()
         except Exception as ex:  # pylint: disable=broad-except
             db.session.rollback()
@@ -536,7 +757,7 @@ class ColumnarToDatabaseView(SimpleFormView):
             'Columnar file "%(columnar_filename)s" uploaded to table "%(table_name)s" '
             'in database "%(db_name)s"',
             columnar_filename=[file.filename for file in form.columnar_file.data],
-            table_name=str(columnar_table),
+            table_name=columnar_table,
             db_name=sqla_table.database.database_name,
         )
         flash(message, "info")
@@ -24,6 +24,7 @@ from typing import Dict, Optional
 
 from unittest import mock
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -43,9 +44,11 @@ test_client = app.test_client()
 CSV_UPLOAD_DATABASE = "csv_explore_db"
 CSV_FILENAME1 = "testCSV1.csv"
 CSV_FILENAME2 = "testCSV2.csv"
+CSV_FILENAME3 = "testCSV3.csv"
 EXCEL_FILENAME = "testExcel.xlsx"
 PARQUET_FILENAME1 = "testZip/testParquet1.parquet"
 PARQUET_FILENAME2 = "testZip/testParquet2.parquet"
+EMPTY_PARQUET_FILENAME = "testEmptyParquet.parquet"
 ZIP_DIRNAME = "testZip"
 ZIP_FILENAME = "testZip.zip"
 
@@ -92,9 +95,17 @@ def create_csv_files():
     with open(CSV_FILENAME2, "w+") as test_file:
         for line in ["b,c,d", "john,1,x", "paul,2,"]:
             test_file.write(f"{line}\n")
+
+    # the column types change after the first chunk of 1000 rows
+    with open(CSV_FILENAME3, "w+") as test_file:
+        test_file.write("a,b\n")
+        for i in range(1000):
+            test_file.write(f"{i},\n")
+        test_file.write("x,y\n")
     yield
     os.remove(CSV_FILENAME1)
     os.remove(CSV_FILENAME2)
+    os.remove(CSV_FILENAME3)
 
 
 @pytest.fixture()
@@ -110,7 +121,11 @@ def create_columnar_files():
     pd.DataFrame({"a": ["john", "paul"], "b": [1, 2]}).to_parquet(PARQUET_FILENAME1)
     pd.DataFrame({"a": ["max", "bob"], "b": [3, 4]}).to_parquet(PARQUET_FILENAME2)
     shutil.make_archive(ZIP_DIRNAME, "zip", ZIP_DIRNAME)
+    pd.DataFrame(
+        {"a": pd.Series([], dtype=str), "b": pd.Series([], dtype=int)}
+    ).to_parquet(EMPTY_PARQUET_FILENAME)
     yield
+    os.remove(EMPTY_PARQUET_FILENAME)
     os.remove(ZIP_FILENAME)
     shutil.rmtree(ZIP_DIRNAME)
 
@@ -334,6 +349,20 @@ def test_import_csv(setup_csv_upload, create_csv_files):
     data = engine.execute(f"SELECT * from {CSV_UPLOAD_TABLE}").fetchall()
     assert data == [("john", 1, "x"), ("paul", 2, None)]
 
+    # column types are inferred from the whole file rather than the first chunk
+    resp = upload_csv(CSV_FILENAME3, CSV_UPLOAD_TABLE, extra={"if_exists": "replace"})
+    success_msg_f3 = (
+        f'CSV file "{CSV_FILENAME3}" uploaded to table "{CSV_UPLOAD_TABLE}"'
+    )
+    assert success_msg_f3 in resp
+
+    data = engine.execute(f"SELECT COUNT(*) from {CSV_UPLOAD_TABLE}").fetchall()
+    assert data == [(1001,)]
+    data = engine.execute(
+        f"SELECT * from {CSV_UPLOAD_TABLE} WHERE a IN ('0', 'x') ORDER BY a"
+    ).fetchall()
+    assert data == [("0", None), ("x", "y")]
+
 
 @mock.patch("superset.db_engine_specs.hive.upload_to_s3", mock_upload_to_s3)
 def test_import_excel(setup_csv_upload, create_excel_files):
@@ -439,3 +468,105 @@ def test_import_parquet(setup_csv_upload, create_columnar_files):
         .fetchall()
     )
     assert data == [("john", 1), ("paul", 2), ("max", 3), ("bob", 4)]
+
+    # replace table with a file without rows
+    resp = upload_columnar(
+        EMPTY_PARQUET_FILENAME, PARQUET_UPLOAD_TABLE, extra={"if_exists": "replace"}
+    )
+    success_msg_f3 = f'Columnar file "[\'{EMPTY_PARQUET_FILENAME}\']" uploaded to table "{PARQUET_UPLOAD_TABLE}"'
+    assert success_msg_f3 in resp
+
+    data = (
+        get_upload_db()
+        .get_sqla_engine()
+        .execute(f"SELECT * from {PARQUET_UPLOAD_TABLE}")
+        .fetchall()
+    )
+    assert data == []
+
+    table = SupersetTestCase.get_table(name=PARQUET_UPLOAD_TABLE)
+    assert table.column_names == ["a", "b"]
+
+
+def test_cast_to_dtypes():
+    from sqlalchemy.types import Text
+
+    from superset.views.database.views import (
+        cast_to_dtypes,
+        get_column_types,
+        get_common_types,
+    )
+
+    chunks = [
+        pd.DataFrame({"a": [1, 2], "b": [None, None]}, dtype=float),
+        pd.DataFrame({"a": ["x"], "b": ["y"], "c": [True]}),
+    ]
+    df = pd.concat(chunks)
+    dtypes, sql_dtypes = get_common_types(map(get_column_types, chunks))
+
+    # pandas would infer the SQL type of "a" from the floats of the first chunk
+    assert list(sql_dtypes) == ["a"]
+    assert isinstance(sql_dtypes["a"], Text)
+
+    for chunk in cast_to_dtypes(chunks, dtypes):
+        assert chunk.dtypes.equals(df.dtypes)
+
+    assert pd.concat(cast_to_dtypes(chunks, dtypes)).equals(df)
+
+    # chunks which already have the types are left untouched
+    dtypes, _ = get_common_types([get_column_types(df)])
+    assert next(cast_to_dtypes([df], dtypes)) is df
+
+    # only the columns whose types differ are cast
+    chunk = pd.DataFrame({"a": [1, 2], "b": [1.5, 2.5]})
+    dtypes = {(False, "a"): np.dtype(float), (False, "b"): np.dtype(float)}
+    cast_chunk = next(cast_to_dtypes([chunk], dtypes))
+
+    assert cast_chunk["a"].dtype == float
+    assert np.shares_memory(cast_chunk["b"].values, chunk["b"].values)
+
+    # the index is cast as well
+    chunks = [
+        pd.DataFrame({"a": [1]}, index=pd.Index([1], name="i")),
+        pd.DataFrame({"a": [2]}, index=pd.Index(["x"], name="i")),
+    ]
+    dtypes, sql_dtypes = get_common_types(map(get_column_types, chunks))
+
+    assert list(sql_dtypes) == ["i"]
+
+    for chunk in cast_to_dtypes(chunks, dtypes):
+        assert chunk.index.dtype == object
+
+
+def test_get_parquet_column_types():
+    import io
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from superset.views.database.views import (
+        get_parquet_column_types,
+        read_parquet_files,
+    )
+
+    buffer = io.BytesIO()
+    table = pa.table({"a": [1, None], "b": [True, None], "c": [True, False]})
+    pq.write_table(table, buffer, row_group_size=1)
+    parquet_file = pq.ParquetFile(buffer)
+    types = get_parquet_column_types(parquet_file, None)
+
+    # integers and booleans with nulls are read as floats and objects
+    assert types[(False, "a")] == (np.dtype(float), "int64")
+    assert types[(False, "b")] == (np.dtype(object), "bool")
+    assert types[(False, "c")] == (np.dtype(bool), "bool")
+
+    dtypes = [df.dtypes for df in read_parquet_files([parquet_file], None)]
+    assert dtypes[-1].to_dict() == {"a": float, "b": object, "c": bool}
+
+
+def test_get_common_extension():
+    from superset.views.database.views import get_common_extension
+
+    assert get_common_extension(["a.parquet", "b.PARQUET"]) == "parquet"
+    assert get_common_extension(["a.zip"]) == "zip"
+    assert get_common_extension(["a.zip", "b.parquet", "c.parquet"]) is None
@@ -17,7 +17,9 @@
 import datetime
 from unittest import mock
 
+import pandas as pd
 import pytest
+from sqlalchemy import create_engine
 
 from superset.db_engine_specs import get_engine_specs
 from superset.db_engine_specs.base import (
@@ -29,7 +31,8 @@ from superset.db_engine_specs.base import (
 from superset.db_engine_specs.mysql import MySQLEngineSpec
 from superset.db_engine_specs.sqlite import SqliteEngineSpec
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
-from superset.sql_parse import ParsedQuery
+from superset.exceptions import NoDataException
+from superset.sql_parse import ParsedQuery, Table
 from superset.utils.core import get_example_database
 from tests.integration_tests.db_engine_specs.base_tests import TestDbEngineSpec
 from tests.integration_tests.test_app import app
@@ -466,3 +469,32 @@ def test_validate_parameters_port_closed(is_port_open, is_hostname_valid):
             },
         )
     ]
+
+
+@mock.patch("superset.db_engine_specs.base.BaseEngineSpec.get_engine")
+def test_df_chunks_to_sql(mock_get_engine):
+    engine = create_engine("sqlite://")
+    mock_get_engine.return_value = engine
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+
+    BaseEngineSpec.df_chunks_to_sql(
+        mock.MagicMock(),
+        Table("foobar"),
+        iter(chunks),
+        {"if_exists": "fail", "index": False},
+    )
+
+    assert engine.execute("SELECT a FROM foobar").fetchall() == [(1,), (2,), (3,)]
+
+
+@mock.patch("superset.db_engine_specs.base.BaseEngineSpec.get_engine")
+def test_df_chunks_to_sql_no_chunks(mock_get_engine):
+    engine = create_engine("sqlite://")
+    mock_get_engine.return_value = engine
+
+    with pytest.raises(NoDataException):
+        BaseEngineSpec.df_chunks_to_sql(
+            mock.MagicMock(), Table("foobar"), iter([]), {"if_exists": "replace"},
+        )
+
+    assert not engine.has_table("foobar")
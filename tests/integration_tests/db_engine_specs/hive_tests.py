@@ -245,6 +245,32 @@ def test_df_to_sql_if_exists_replace_with_schema(mock_upload_to_s3, mock_g):
     app.config = config
 
 
+@mock.patch("superset.db_engine_specs.hive.HiveEngineSpec.df_to_sql")
+def test_df_chunks_to_sql(mock_df_to_sql):
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+    to_sql_kwargs = {"if_exists": "replace"}
+
+    HiveEngineSpec.df_chunks_to_sql(
+        mock.MagicMock(), Table("foobar"), iter(chunks), to_sql_kwargs
+    )
+
+    mock_df_to_sql.assert_called_once()
+    _, _, df, kwargs = mock_df_to_sql.call_args[0]
+    assert df["a"].tolist() == [1, 2, 3]
+    assert kwargs == {"if_exists": "replace"}
+
+
+@mock.patch("superset.db_engine_specs.hive.HiveEngineSpec.df_to_sql")
+def test_df_chunks_to_sql_single_chunk(mock_df_to_sql):
+    df = pd.DataFrame({"a": [1, 2]})
+
+    HiveEngineSpec.df_chunks_to_sql(
+        mock.MagicMock(), Table("foobar"), iter([df]), {"if_exists": "replace"}
+    )
+
+    assert mock_df_to_sql.call_args[0][2] is df
+
+
 def test_is_readonly():
     def is_readonly(sql: str) -> bool:
         return HiveEngineSpec.is_readonly_query(ParsedQuery(sql))
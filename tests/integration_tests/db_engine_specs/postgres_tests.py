@@ -21,9 +21,15 @@ from sqlalchemy import column, literal_column
 from sqlalchemy.dialects import postgresql
 
 from superset.db_engine_specs import get_engine_specs
-from superset.db_engine_specs.postgres import PostgresEngineSpec
+from superset.db_engine_specs.cockroachdb import CockroachDbEngineSpec
+from superset.db_engine_specs.postgres import (
+    copy_from_stdin,
+    PostgresEngineSpec,
+    TextIteratorIO,
+)
 from superset.errors import ErrorLevel, SupersetError, SupersetErrorType
 from superset.models.sql_lab import Query
+from superset.sql_parse import Table
 from superset.utils.core import GenericDataType
 from tests.integration_tests.db_engine_specs.base_tests import (
     assert_generic_types,
@@ -538,3 +544,64 @@ def test_generic_type():
         ("BOOLEAN", GenericDataType.BOOLEAN),
     )
     assert_generic_types(PostgresEngineSpec, type_expectations)
+
+
+def test_get_df_to_sql_method():
+    dialect = postgresql.dialect()
+    assert PostgresEngineSpec.get_df_to_sql_method(dialect) == copy_from_stdin
+
+    dialect = postgresql.dialect()
+    dialect.driver = "pg8000"
+    assert PostgresEngineSpec.get_df_to_sql_method(dialect) == "multi"
+
+    dialect = postgresql.dialect()
+    assert CockroachDbEngineSpec.get_df_to_sql_method(dialect) == "multi"
+
+
+def test_df_to_sql():
+    con = mock.Mock()
+    con.dialect = postgresql.dialect()
+    df = mock.Mock()
+
+    PostgresEngineSpec._df_to_sql(con, Table("foo"), df, {"chunksize": 1000})
+    df.to_sql.assert_called_once_with(con=con, name="foo", method=copy_from_stdin)
+
+    con.dialect.driver = "pg8000"
+    df = mock.Mock()
+
+    PostgresEngineSpec._df_to_sql(con, Table("foo"), df, {"chunksize": 1000})
+    df.to_sql.assert_called_once_with(
+        con=con, name="foo", method="multi", chunksize=1000
+    )
+
+
+def test_copy_from_stdin():
+    table = mock.Mock()
+    table.name = "foo"
+    table.schema = "bar"
+    connection = mock.Mock()
+    connection.dialect = postgresql.dialect()
+    cursor = connection.connection.cursor.return_value.__enter__.return_value
+
+    copy_from_stdin(
+        table, connection, ["a", "b"], [(1, "x\ty"), (None, "back\\slash")],
+    )
+
+    sql, stream = cursor.copy_expert.call_args[0]
+    assert sql == "COPY bar.foo (a, b) FROM STDIN"
+    assert stream.read() == "1\tx\\ty\n\\N\tback\\\\slash\n"
+
+
+def test_text_iterator_io():
+    stream = TextIteratorIO(iter(["abc\n", "de\n", "fghij\n"]))
+    assert stream.read(4) == "abc\n"
+    assert stream.read(4) == "de\nf"
+    assert stream.read() == "ghij\n"
+    assert stream.read(4) == ""
+
+    # parts longer than the size are read across several reads
+    stream = TextIteratorIO(iter(["abcdefghij\n", "", "k\n"]))
+    assert stream.read(4) == "abcd"
+    assert stream.read(4) == "efgh"
+    assert stream.read(5) == "ij\nk\n"
+    assert stream.read(4) == ""